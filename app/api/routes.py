@@ -1,12 +1,14 @@
-from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi import APIRouter, HTTPException, Depends, Header, Request, Response
 from typing import List, Optional
 from datetime import datetime
 
-from app.models.calendar import CalendarEvent, CalendarEventCreate, CalendarEventUpdate
+from app.models.calendar import CalendarEvent, CalendarEventCreate, CalendarEventUpdate, event_list_adapter
 from app.models.chat import ChatRequest, ChatResponse
 from app.services.calendar_service import CalendarService
 from app.services.chat_service import ChatService
 from app.mcp.server import MCPServer
+from app.mcp.tools import MCPTools
+from app.skills.loader import skill_loader
 from app.config import get_settings
 
 # 创建路由
@@ -15,13 +17,20 @@ router = APIRouter()
 # 全局日历服务实例
 calendar_service = CalendarService()
 
+# 全局 MCP 服务器实例（无状态，所有请求共用）
+mcp_server = MCPServer(calendar_service)
 
-def get_chat_service(api_key: Optional[str] = Header(None, alias="X-API-Key")) -> ChatService:
+
+def get_chat_service(
+    request: Request,
+    api_key: Optional[str] = Header(None, alias="X-API-Key")
+) -> ChatService:
     """
     依赖注入：根据请求头中的 API Key 创建 ChatService
     如果没有传 API Key，使用 .env 中配置的默认 Key
     
     Args:
+        request: 当前请求（用于获取应用共享的 HTTP 连接池）
         api_key: 用户的 API Key（可选）
         
     Returns:
@@ -38,8 +47,7 @@ def get_chat_service(api_key: Optional[str] = Header(None, alias="X-API-Key")) -
             detail="API Key is required. Please provide X-API-Key header or configure API_KEY in .env file."
         )
     
-    mcp_server = MCPServer(calendar_service)
-    return ChatService(mcp_server, api_key=final_api_key)
+    return ChatService(mcp_server, api_key=final_api_key, http_client=request.app.state.http_client)
 
 
 # ==================== 对话接口 ====================
@@ -102,7 +110,10 @@ async def list_events(
             end_date=end,
             keyword=keyword
         )
-        return events
+        return Response(
+            content=event_list_adapter.dump_json(events),
+            media_type="application/json"
+        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -119,7 +130,10 @@ async def get_event(event_id: str):
 @router.put("/events/{event_id}", response_model=CalendarEvent)
 async def update_event(event_id: str, event_update: CalendarEventUpdate):
     """更新日历事件"""
-    event = await calendar_service.update_event(event_id, event_update)
+    try:
+        event = await calendar_service.update_event(event_id, event_update)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     return event
@@ -139,14 +153,12 @@ async def delete_event(event_id: str):
 @router.get("/tools")
 async def get_available_tools():
     """获取可用的 MCP 工具列表"""
-    from app.mcp.tools import MCPTools
     return {"tools": MCPTools.get_tool_definitions()}
 
 
 @router.get("/skills")
 async def get_available_skills():
     """获取可用的 Skills 列表"""
-    from app.skills.loader import skill_loader
     return {
         "skills": skill_loader.get_skill_names(),
         "details": skill_loader.get_all_skills()
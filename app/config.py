@@ -1,4 +1,4 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
 from typing import Optional
 
@@ -17,10 +17,11 @@ class Settings(BaseSettings):
     # Model
     model: str = "moonshot-v1-8k"  # 可选: moonshot-v1-8k, moonshot-v1-32k, moonshot-v1-128k
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
-        extra = 'ignore'
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=False,
+        extra='ignore'
+    )
 
 
 @lru_cache()
@@ -2,9 +2,8 @@
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from sqlalchemy import Column, String, DateTime, Boolean, Text, JSON
+from sqlalchemy import create_engine, Column, String, DateTime, Boolean, Text, JSON
 from datetime import datetime
-from typing import Optional
 from uuid import uuid4
 import os
 
@@ -58,6 +57,15 @@ async def init_db():
     print(f"✅ 数据库初始化完成: {DATABASE_PATH}")
 
 
+def init_db_sync():
+    """同步建表，供多进程启动前在主进程中执行一次，避免多个 worker 同时建表冲突"""
+    sync_engine = create_engine(f"sqlite:///{DATABASE_PATH}")
+    try:
+        Base.metadata.create_all(sync_engine)
+    finally:
+        sync_engine.dispose()
+
+
 async def get_db() -> AsyncSession:
     """获取数据库会话（用于依赖注入）"""
     async with AsyncSessionLocal() as session:
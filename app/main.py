@@ -4,6 +4,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes import router
 from app.config import get_settings
 from app.database import init_db
+from openai import DefaultAsyncHttpxClient
 
 # 获取配置
 settings = get_settings()
@@ -14,8 +15,11 @@ async def lifespan(app: FastAPI):
     """应用生命周期管理"""
     # 启动时初始化数据库
     await init_db()
+    # 共享的 AI API 连接池：ChatService 按请求创建，复用连接避免每次请求重新建立 TCP/TLS 连接
+    app.state.http_client = DefaultAsyncHttpxClient()
     yield
-    # 关闭时可以在这里清理资源
+    # 关闭时释放连接池
+    await app.state.http_client.aclose()
 
 
 # 创建 FastAPI 应用
@@ -66,10 +70,16 @@ async def health_check():
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
+    from app.database import init_db_sync
+    # 在启动 worker 之前先建表，各 worker 的 lifespan 中 create_all 只会检查到表已存在
+    init_db_sync()
+    # 非调试模式按 CPU 核数启动多进程；调试模式下热重载只能单进程
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=settings.debug
+        reload=settings.debug,
+        workers=1 if settings.debug else (os.cpu_count() or 1)
     )
@@ -1,6 +1,9 @@
-from typing import Dict, Any, Optional, List
-from datetime import datetime, date
-from app.models.calendar import CalendarEvent, CalendarEventCreate, CalendarEventUpdate, RecurrenceRule
+from typing import Dict, Any
+from datetime import datetime, date, timedelta
+from app.models.calendar import CalendarEventCreate, CalendarEventUpdate, RecurrenceRule, event_list_adapter
+
+# 纯日期的结束时间偏移（当天 23:59:59）
+END_OF_DAY = timedelta(hours=23, minutes=59, seconds=59)
 
 
 class MCPServer:
@@ -13,6 +16,13 @@ class MCPServer:
             calendar_service: 日历服务实例
         """
         self.calendar_service = calendar_service
+        # 工具名称 -> 处理方法，初始化时绑定一次
+        self._handlers = {
+            "create_event": self._create_event,
+            "list_events": self._list_events,
+            "update_event": self._update_event,
+            "delete_event": self._delete_event,
+        }
     
     
     async def execute_tool(self, tool_name: str, tool_input: Dict[str, Any]) -> Dict[str, Any]:
@@ -25,20 +35,15 @@ class MCPServer:
         Returns:
             工具执行结果
         """
+        handler = self._handlers.get(tool_name)
+        if handler is None:
+            return {
+                "success": False,
+                "error": f"Unknown tool: {tool_name}"
+            }
+        
         try:
-            if tool_name == "create_event":
-                return await self._create_event(tool_input)
-            elif tool_name == "list_events":
-                return await self._list_events(tool_input)
-            elif tool_name == "update_event":
-                return await self._update_event(tool_input)
-            elif tool_name == "delete_event":
-                return await self._delete_event(tool_input)
-            else:
-                return {
-                    "success": False,
-                    "error": f"Unknown tool: {tool_name}"
-                }
+            return await handler(tool_input)
         except Exception as e:
             return {
                 "success": False,
@@ -81,8 +86,8 @@ class MCPServer:
             
             # 构建返回消息
             if event.recurrence_rule:
-                instances = await self.calendar_service.get_events_by_parent(event.id)
-                message = f"成功创建重复事件: {event.title}，共生成 {len(instances) + 1} 个实例"
+                instance_count = await self.calendar_service.count_events_by_parent(event.id)
+                message = f"成功创建重复事件: {event.title}，共生成 {instance_count + 1} 个实例"
             else:
                 message = f"成功创建事件: {event.title}"
             
@@ -105,18 +110,15 @@ class MCPServer:
             keyword = params.get("keyword")
             
             if "start_date" in params and params["start_date"]:
-                # 支持纯日期格式（自动转为当天开始时间）
-                start_str = params["start_date"]
-                if len(start_str) == 10:  # YYYY-MM-DD
-                    start_str += "T00:00:00"
-                start_date = datetime.fromisoformat(start_str)
+                # 支持纯日期格式（fromisoformat 直接解析为当天开始时间）
+                start_date = datetime.fromisoformat(params["start_date"])
             
             if "end_date" in params and params["end_date"]:
                 # 支持纯日期格式（自动转为当天结束时间）
                 end_str = params["end_date"]
-                if len(end_str) == 10:  # YYYY-MM-DD
-                    end_str += "T23:59:59"
                 end_date = datetime.fromisoformat(end_str)
+                if len(end_str) == 10:  # YYYY-MM-DD
+                    end_date += END_OF_DAY
             
             events = await self.calendar_service.list_events(
                 start_date=start_date,
@@ -126,7 +128,7 @@ class MCPServer:
             
             return {
                 "success": True,
-                "events": [e.model_dump(mode="json") for e in events],
+                "events": event_list_adapter.dump_python(events, mode="json"),
                 "count": len(events),
                 "message": f"找到 {len(events)} 个事件"
             }
@@ -141,17 +143,19 @@ class MCPServer:
         try:
             event_id = params["event_id"]
             
-            update_data = CalendarEventUpdate()
+            # 先收集字段再构造模型，确保模型校验（时间顺序）生效
+            fields = {}
             if "title" in params:
-                update_data.title = params["title"]
+                fields["title"] = params["title"]
             if "start_time" in params:
-                update_data.start_time = datetime.fromisoformat(params["start_time"])
+                fields["start_time"] = datetime.fromisoformat(params["start_time"])
             if "end_time" in params:
-                update_data.end_time = datetime.fromisoformat(params["end_time"])
+                fields["end_time"] = datetime.fromisoformat(params["end_time"])
             if "description" in params:
-                update_data.description = params["description"]
+                fields["description"] = params["description"]
             if "location" in params:
-                update_data.location = params["location"]
+                fields["location"] = params["location"]
+            update_data = CalendarEventUpdate(**fields)
             
             event = await self.calendar_service.update_event(event_id, update_data)
             
@@ -178,20 +182,10 @@ class MCPServer:
             event_id = params["event_id"]
             delete_all = params.get("delete_all_instances", True)
             
-            # 获取事件信息用于确认
-            event = await self.calendar_service.get_event(event_id)
-            if not event:
-                return {
-                    "success": False,
-                    "error": f"未找到ID为 {event_id} 的事件"
-                }
+            # 查询和删除合并为一次调用，返回被删除的事件用于确认
+            event = await self.calendar_service.pop_event(event_id, delete_all_instances=delete_all)
             
-            # 保存事件信息用于返回
-            event_data = event.model_dump(mode="json")
-            
-            success = await self.calendar_service.delete_event(event_id, delete_all_instances=delete_all)
-            
-            if success:
+            if event:
                 if event.parent_event_id:
                     if delete_all:
                         message = f"成功删除重复事件及其所有实例: {event.title}"
@@ -205,12 +199,12 @@ class MCPServer:
                 return {
                     "success": True,
                     "message": message,
-                    "event": event_data
+                    "event": event.model_dump(mode="json")
                 }
             else:
                 return {
                     "success": False,
-                    "error": f"删除事件失败"
+                    "error": f"未找到ID为 {event_id} 的事件"
                 }
         except Exception as e:
             return {
@@ -1,14 +1,17 @@
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from functools import lru_cache
+from typing import List, Dict, Any
 
 
 class MCPTools:
     """MCP 工具定义 - 定义可供Claude调用的工具"""
     
     @staticmethod
+    @lru_cache(maxsize=1)
     def get_tool_definitions() -> List[Dict[str, Any]]:
         """
         获取所有工具的定义 （符合Anthropic Tool use格式）
+        
+        工具定义是静态的，只构建一次，后续调用返回同一个列表（调用方不应修改）
         Returns:
             List[Dict[str, Any]]: 工具定义列表
         """
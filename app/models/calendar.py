@@ -1,9 +1,16 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, model_validator
 from datetime import datetime, date
 from typing import Optional, List, Literal
 from uuid import uuid4
 
 
+def to_naive_local(value: datetime) -> datetime:
+    """将带时区的时间转换为本地无时区时间，便于与无时区时间（及 SQLite 中存储的时间）比较"""
+    if value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
 class RecurrenceRule(BaseModel):
     """重复规则模型"""
     
@@ -13,14 +20,15 @@ class RecurrenceRule(BaseModel):
     )
     end_date: Optional[date] = Field(None, description="重复结束日期，默认为3个月后")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "type": "weekly",
                 "days": ["monday", "tuesday", "wednesday", "thursday", "friday"],
                 "end_date": "2024-06-30"
             }
         }
+    )
 
 
 class CalendarEvent(BaseModel):
@@ -39,8 +47,8 @@ class CalendarEvent(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "title": "团队会议",
                 "start_time": "2023-10-15T09:00:00",
@@ -50,6 +58,7 @@ class CalendarEvent(BaseModel):
                 "is_recurring": False
             }
         }
+    )
     
     
 class CalendarEventCreate(BaseModel):
@@ -62,6 +71,13 @@ class CalendarEventCreate(BaseModel):
     location: Optional[str] = None
     # 重复事件支持
     recurrence_rule: Optional[RecurrenceRule] = None
+    
+    @model_validator(mode="after")
+    def _check_times(self) -> "CalendarEventCreate":
+        """校验结束时间晚于开始时间"""
+        if to_naive_local(self.end_time) <= to_naive_local(self.start_time):
+            raise ValueError("结束时间必须晚于开始时间")
+        return self
 
 
 class CalendarEventUpdate(BaseModel):
@@ -72,6 +88,17 @@ class CalendarEventUpdate(BaseModel):
     end_time: Optional[datetime] = None
     description: Optional[str] = None
     location: Optional[str] = None
+    
+    @model_validator(mode="after")
+    def _check_times(self) -> "CalendarEventUpdate":
+        """同时更新开始和结束时间时，校验结束时间晚于开始时间"""
+        if (
+            self.start_time is not None
+            and self.end_time is not None
+            and to_naive_local(self.end_time) <= to_naive_local(self.start_time)
+        ):
+            raise ValueError("结束时间必须晚于开始时间")
+        return self
 
 
 class RecurringEventCreate(BaseModel):
@@ -85,3 +112,7 @@ class RecurringEventCreate(BaseModel):
     recurrence_type: Literal["daily", "weekly", "monthly"] = Field(..., description="重复类型")
     recurrence_days: Optional[List[str]] = Field(None, description="每周重复的星期几")
     recurrence_end_date: Optional[date] = Field(None, description="重复结束日期")
+
+
+# 事件列表序列化器（编译一次，供 API 和 MCP 工具批量序列化）
+event_list_adapter = TypeAdapter(List[CalendarEvent])
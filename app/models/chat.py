@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 
 
@@ -18,13 +18,14 @@ class ChatRequest(BaseModel):
         description="对话历史"
     )
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "message": "帮我添加一个明天下午3点的会议",
                 "conversation_history": []
             }
         }
+    )
 
 
 class ChatResponse(BaseModel):
@@ -1,12 +1,18 @@
-from typing import List, Optional, Dict
-from datetime import datetime, timedelta, date
+from typing import List, Optional
+from datetime import datetime, timedelta, date, time
 from uuid import uuid4
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, or_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.calendar import CalendarEvent, CalendarEventCreate, CalendarEventUpdate, RecurrenceRule
+from app.models.calendar import CalendarEvent, CalendarEventCreate, CalendarEventUpdate, RecurrenceRule, to_naive_local
 from app.database import EventModel, AsyncSessionLocal
 
+# 星期映射
+WEEKDAY_INDEX = {
+    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
+    "friday": 4, "saturday": 5, "sunday": 6
+}
+
 
 class CalendarService:
     
@@ -93,83 +99,36 @@ class CalendarService:
         """
         instances = []
         
-        # 计算事件持续时间
+        # 计算事件持续时间和每日开始时刻
         duration = parent_event.end_time - parent_event.start_time
+        start_clock = parent_event.start_time.time()
         
         # 确定结束日期（默认3个月后）
         end_date = rule.end_date or (parent_event.start_time.date() + timedelta(days=90))
         start_date = parent_event.start_time.date()
         
-        # 星期映射
-        day_map = {
-            "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
-            "friday": 4, "saturday": 5, "sunday": 6
-        }
-        
         current_date = start_date + timedelta(days=1)  # 从第二天开始生成
         
         if rule.type == "daily":
             # 每天重复
             while current_date <= end_date:
-                instance_start = datetime.combine(current_date, parent_event.start_time.time())
-                instance_end = instance_start + duration
-                
-                instance = EventModel(
-                    id=str(uuid4()),
-                    title=parent_event.title,
-                    start_time=instance_start,
-                    end_time=instance_end,
-                    description=parent_event.description,
-                    location=parent_event.location,
-                    is_recurring=True,
-                    parent_event_id=parent_event.id,
-                )
-                session.add(instance)
-                instances.append(instance)
+                instances.append(self._build_instance(parent_event, current_date, start_clock, duration))
                 current_date += timedelta(days=1)
                 
         elif rule.type == "weekly":
             # 每周重复特定几天
             if rule.days:
-                target_weekdays = [day_map[d] for d in rule.days]
+                target_weekdays = frozenset(WEEKDAY_INDEX[d] for d in rule.days)
                 
                 while current_date <= end_date:
                     if current_date.weekday() in target_weekdays:
-                        instance_start = datetime.combine(current_date, parent_event.start_time.time())
-                        instance_end = instance_start + duration
-                        
-                        instance = EventModel(
-                            id=str(uuid4()),
-                            title=parent_event.title,
-                            start_time=instance_start,
-                            end_time=instance_end,
-                            description=parent_event.description,
-                            location=parent_event.location,
-                            is_recurring=True,
-                            parent_event_id=parent_event.id,
-                        )
-                        session.add(instance)
-                        instances.append(instance)
+                        instances.append(self._build_instance(parent_event, current_date, start_clock, duration))
                     
                     current_date += timedelta(days=1)
             else:
                 # 如果没有指定具体星期几，每周同一天重复
                 while current_date <= end_date:
-                    instance_start = datetime.combine(current_date, parent_event.start_time.time())
-                    instance_end = instance_start + duration
-                    
-                    instance = EventModel(
-                        id=str(uuid4()),
-                        title=parent_event.title,
-                        start_time=instance_start,
-                        end_time=instance_end,
-                        description=parent_event.description,
-                        location=parent_event.location,
-                        is_recurring=True,
-                        parent_event_id=parent_event.id,
-                    )
-                    session.add(instance)
-                    instances.append(instance)
+                    instances.append(self._build_instance(parent_event, current_date, start_clock, duration))
                     current_date += timedelta(days=7)
                     
         elif rule.type == "monthly":
@@ -194,21 +153,7 @@ class CalendarService:
                     break
                     
                 if instance_date >= current_date:
-                    instance_start = datetime.combine(instance_date, parent_event.start_time.time())
-                    instance_end = instance_start + duration
-                    
-                    instance = EventModel(
-                        id=str(uuid4()),
-                        title=parent_event.title,
-                        start_time=instance_start,
-                        end_time=instance_end,
-                        description=parent_event.description,
-                        location=parent_event.location,
-                        is_recurring=True,
-                        parent_event_id=parent_event.id,
-                    )
-                    session.add(instance)
-                    instances.append(instance)
+                    instances.append(self._build_instance(parent_event, instance_date, start_clock, duration))
                 
                 # 进入下一个月
                 if current_month == 12:
@@ -217,8 +162,37 @@ class CalendarService:
                 else:
                     current_month += 1
         
+        # 一次性加入会话，由调用方统一提交
+        session.add_all(instances)
         return instances
 
+    def _build_instance(
+        self,
+        parent_event: EventModel,
+        instance_date: date,
+        start_clock: time,
+        duration: timedelta
+    ) -> EventModel:
+        """构建重复事件的单个实例
+
+        :param parent_event: 父事件
+        :param instance_date: 实例日期
+        :param start_clock: 每个实例的开始时刻
+        :param duration: 事件持续时间
+        :return: 实例数据库模型
+        """
+        instance_start = datetime.combine(instance_date, start_clock)
+        return EventModel(
+            id=str(uuid4()),
+            title=parent_event.title,
+            start_time=instance_start,
+            end_time=instance_start + duration,
+            description=parent_event.description,
+            location=parent_event.location,
+            is_recurring=True,
+            parent_event_id=parent_event.id,
+        )
+
     async def get_event(self, event_id: str) -> Optional[CalendarEvent]:
         """获取单个事件
 
@@ -293,7 +267,17 @@ class CalendarService:
             
             if not db_event:
                 return None
-            
+
+            # 没有任何需要更新的字段时直接返回，跳过写入和提交
+            if not update_data.model_dump(exclude_none=True):
+                return self._to_pydantic(db_event)
+
+            # 合并新旧值后校验时间顺序（只更新其中一个时间时也要检查）
+            start_time = update_data.start_time or db_event.start_time
+            end_time = update_data.end_time or db_event.end_time
+            if to_naive_local(end_time) <= to_naive_local(start_time):
+                raise ValueError("结束时间必须晚于开始时间")
+
             # 更新字段
             if update_data.title is not None:
                 db_event.title = update_data.title
@@ -320,6 +304,15 @@ class CalendarService:
         :param delete_all_instances: 如果是重复事件，是否删除所有实例
         :return: 是否删除成功
         """
+        return await self.pop_event(event_id, delete_all_instances) is not None
+
+    async def pop_event(self, event_id: str, delete_all_instances: bool = True) -> Optional[CalendarEvent]:
+        """删除事件并返回被删除的事件，查询和删除在同一个会话中完成
+
+        :param event_id: 事件ID
+        :param delete_all_instances: 如果是重复事件，是否删除所有实例
+        :return: 被删除的事件，如果不存在则返回None
+        """
         async with await self._get_session() as session:
             result = await session.execute(
                 select(EventModel).where(EventModel.id == event_id)
@@ -327,35 +320,31 @@ class CalendarService:
             event = result.scalar_one_or_none()
             
             if not event:
-                return False
+                return None
             
-            # 如果是父事件且有重复规则，删除所有实例
-            if delete_all_instances and event.recurrence_rule:
-                await session.execute(
-                    EventModel.__table__.delete().where(
-                        EventModel.parent_event_id == event_id
-                    )
-                )
+            # 删除前保存事件信息用于返回
+            deleted = self._to_pydantic(event)
             
-            # 如果是重复事件的实例，且要删除所有相关实例
-            if delete_all_instances and event.parent_event_id:
-                parent_id = event.parent_event_id
-                # 删除父事件
-                await session.execute(
-                    EventModel.__table__.delete().where(EventModel.id == parent_id)
-                )
-                # 删除所有实例
+            # 确定要整体删除的重复系列：实例取其父事件，带重复规则的父事件取自身
+            series_id = None
+            if delete_all_instances:
+                if event.parent_event_id:
+                    series_id = event.parent_event_id
+                elif event.recurrence_rule:
+                    series_id = event_id
+            
+            if series_id:
+                # 父事件和所有实例用一条语句删除
                 await session.execute(
                     EventModel.__table__.delete().where(
-                        EventModel.parent_event_id == parent_id
+                        or_(EventModel.id == series_id, EventModel.parent_event_id == series_id)
                     )
                 )
-                await session.commit()
-                return True
+            else:
+                await session.delete(event)
             
-            await session.delete(event)
             await session.commit()
-            return True
+            return deleted
 
     async def get_all_events(self) -> List[CalendarEvent]:
         """获取所有事件
@@ -378,3 +367,17 @@ class CalendarService:
             )
             db_events = result.scalars().all()
             return [self._to_pydantic(e) for e in db_events]
+    
+    async def count_events_by_parent(self, parent_event_id: str) -> int:
+        """统计某个父事件的重复实例数量
+
+        :param parent_event_id: 父事件ID
+        :return: 重复实例数量
+        """
+        async with await self._get_session() as session:
+            result = await session.execute(
+                select(func.count())
+                .select_from(EventModel)
+                .where(EventModel.parent_event_id == parent_event_id)
+            )
+            return result.scalar_one()
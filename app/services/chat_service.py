@@ -1,22 +1,37 @@
-from typing import List, Dict, Any
-from openai import OpenAI
+import asyncio
+import json
+import logging
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import List, Dict, Any, Optional
+import httpx
+from openai import AsyncOpenAI
 from app.config import get_settings
-from app.models.chat import ChatMessage, ChatRequest, ChatResponse
+from app.models.chat import ChatRequest, ChatResponse
 from app.mcp.tools import MCPTools
 from app.mcp.server import MCPServer
 from app.skills.loader import skill_loader
 
+logger = logging.getLogger(__name__)
+
+# 只读工具：同一次对话处理中相同参数的调用可以复用结果
+READ_ONLY_TOOLS = frozenset({"list_events"})
+
+# 星期名称（周一=0, 周日=6）
+WEEKDAY_NAMES = ("周一", "周二", "周三", "周四", "周五", "周六", "周日")
+
 
 class ChatService:
     """对话服务 - 处理与 AI API 的交互"""
     
-    def __init__(self, mcp_server: MCPServer, api_key: str):
+    def __init__(self, mcp_server: MCPServer, api_key: str, http_client: Optional[httpx.AsyncClient] = None):
         """
         初始化对话服务
         
         Args:
             mcp_server: MCP 服务器实例
             api_key: API Key（必需）
+            http_client: 共享的 HTTP 连接池（由应用 lifespan 管理，不传则由 OpenAI 客户端自行创建）
         """
         if not api_key:
             raise ValueError("API Key is required")
@@ -24,19 +39,27 @@ class ChatService:
         settings = get_settings()
         
         self.api_key = api_key
-        # 使用 OpenAI 客户端连接 Kimi API
-        self.client = OpenAI(
+        # 使用 OpenAI 异步客户端连接 Kimi API，避免阻塞事件循环
+        self.client = AsyncOpenAI(
             api_key=self.api_key,
-            base_url=settings.api_base_url
+            base_url=settings.api_base_url,
+            http_client=http_client
         )
         self.model = settings.model
         self.mcp_server = mcp_server
-        self.tools = self._convert_tools_to_openai_format(MCPTools.get_tool_definitions())
+        self.tools = self._get_openai_tools()
         
-        # 加载 Skills
-        self.system_prompt = self._build_system_prompt()
+        # 加载 Skills（系统提示词只依赖当天日期，按日期缓存）
+        self.system_prompt = self._build_system_prompt(date.today())
     
-    def _convert_tools_to_openai_format(self, anthropic_tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _get_openai_tools() -> List[Dict[str, Any]]:
+        """获取 OpenAI 格式的工具定义（工具集启动后不变，只转换一次，并保证每次请求发送的 tools 字节一致）"""
+        return ChatService._convert_tools_to_openai_format(MCPTools.get_tool_definitions())
+    
+    @staticmethod
+    def _convert_tools_to_openai_format(anthropic_tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         将 Anthropic 工具格式转换为 OpenAI 格式
         
@@ -58,12 +81,18 @@ class ChatService:
             })
         return openai_tools
     
-    def _build_system_prompt(self) -> str:
-        """构建系统提示词"""
-        from datetime import datetime, timedelta
+    @staticmethod
+    @lru_cache(maxsize=2)
+    def _build_system_prompt(today: date) -> str:
+        """
+        构建系统提示词
         
-        now = datetime.now()
-        today = now.date()
+        Args:
+            today: 当前日期
+            
+        Returns:
+            系统提示词（同一天内复用缓存结果）
+        """
         tomorrow = today + timedelta(days=1)
         day_after_tomorrow = today + timedelta(days=2)
         
@@ -74,7 +103,9 @@ class ChatService:
         monday_next_week = monday_this_week + timedelta(days=7)
         friday_next_week = monday_next_week + timedelta(days=4)
         
-        base_prompt = f"""你是一个智能日历助手，帮助用户管理他们的日程安排。
+        # 静态指令和 Skills 文档放在最前面，保证同一前缀在各次请求间逐字节一致，
+        # 便于服务端复用前缀缓存；只随日期变化的内容放在末尾
+        base_prompt = """你是一个智能日历助手，帮助用户管理他们的日程安排。
 
 你可以通过以下工具来操作日历：
 - create_event: 创建新事件（支持单次事件或重复事件）
@@ -82,25 +113,6 @@ class ChatService:
 - update_event: 更新已有事件
 - delete_event: 删除事件
 
-当前日期时间参考：
-- 今天: {today.isoformat()} ({['周一','周二','周三','周四','周五','周六','周日'][today.weekday()]})
-- 明天: {tomorrow.isoformat()} ({['周一','周二','周三','周四','周五','周六','周日'][tomorrow.weekday()]})
-- 后天: {day_after_tomorrow.isoformat()} ({['周一','周二','周三','周四','周五','周六','周日'][day_after_tomorrow.weekday()]})
-- 本周一: {monday_this_week.isoformat()}
-- 本周五: {friday_this_week.isoformat()}
-- 下周一: {monday_next_week.isoformat()}
-- 下周五: {friday_next_week.isoformat()}
-
-相对时间转换指南：
-- "今天" = {today.isoformat()}
-- "明天" = {tomorrow.isoformat()}
-- "后天" = {day_after_tomorrow.isoformat()}
-- "大后天" = {(today + timedelta(days=3)).isoformat()}
-- "下周X" = 下周一 + X天 (X为周一到周日的偏移)
-- "晚上X点" = 使用24小时制，晚上6点 = 18:00
-- "下午X点" = 使用24小时制，下午3点 = 15:00
-- "早上X点" = 使用24小时制，早上9点 = 09:00
-
 重复事件支持：
 - 当用户要求创建"每周"、"每天"、"每月"等重复事件时，使用 recurrence_rule 参数
 - recurrence_type: "daily"(每天), "weekly"(每周), "monthly"(每月)
@@ -148,6 +160,30 @@ class ChatService:
         if calendar_skill:
             base_prompt += f"\n\n## Calendar Skill Documentation\n\n{calendar_skill}"
         
+        # 添加日期参考（动态部分，单独成节，避免与 Skills 文档末尾的示例混在一起）
+        base_prompt += f"""
+
+## 当前日期时间参考
+
+- 今天: {today.isoformat()} ({WEEKDAY_NAMES[today.weekday()]})
+- 明天: {tomorrow.isoformat()} ({WEEKDAY_NAMES[tomorrow.weekday()]})
+- 后天: {day_after_tomorrow.isoformat()} ({WEEKDAY_NAMES[day_after_tomorrow.weekday()]})
+- 本周一: {monday_this_week.isoformat()}
+- 本周五: {friday_this_week.isoformat()}
+- 下周一: {monday_next_week.isoformat()}
+- 下周五: {friday_next_week.isoformat()}
+
+相对时间转换指南：
+- "今天" = {today.isoformat()}
+- "明天" = {tomorrow.isoformat()}
+- "后天" = {day_after_tomorrow.isoformat()}
+- "大后天" = {(today + timedelta(days=3)).isoformat()}
+- "下周X" = 下周一 + X天 (X为周一到周日的偏移)
+- "晚上X点" = 使用24小时制，晚上6点 = 18:00
+- "下午X点" = 使用24小时制，下午3点 = 15:00
+- "早上X点" = 使用24小时制，早上9点 = 09:00
+"""
+        
         return base_prompt
     
     async def process_message(self, request: ChatRequest) -> ChatResponse:
@@ -166,20 +202,27 @@ class ChatService:
         # 调用 Kimi API
         tool_calls = []
         events_modified = []
+        tool_cache: Dict[tuple, Dict[str, Any]] = {}
         
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            tools=self.tools,
-            tool_choice="auto"
-        )
-        
-        # 处理响应
+        # 首次请求之后允许 AI 继续调用工具（如先 list_events 再 delete_event），
+        # 循环处理多轮工具调用，直到 AI 返回文字回复
+        max_iterations = 5
         assistant_message = ""
-        response_message = response.choices[0].message
-        
-        # 处理工具调用
-        if response_message.tool_calls:
+        for _ in range(max_iterations + 1):
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                tools=self.tools,
+                tool_choice="auto"
+            )
+            
+            response_message = response.choices[0].message
+            
+            # 如果 AI 不再调用工具，获取最终回复
+            if not response_message.tool_calls:
+                assistant_message = response_message.content or ""
+                break
+            
             # 添加助手消息到历史
             messages.append({
                 "role": "assistant",
@@ -198,97 +241,11 @@ class ChatService:
             })
             
             # 执行所有工具调用
-            for tool_call in response_message.tool_calls:
-                import json
-                
-                tool_name = tool_call.function.name
-                tool_input = json.loads(tool_call.function.arguments)
-                
-                # 记录工具调用
-                tool_calls.append({
-                    "name": tool_name,
-                    "input": tool_input
-                })
-                
-                # 执行工具
-                result = await self.mcp_server.execute_tool(tool_name, tool_input)
-                
-                # 记录修改的事件
-                if result.get("success") and "event" in result:
-                    events_modified.append(result["event"]["id"])
-                
-                # 添加工具结果
-                messages.append({
-                    "role": "tool",
-                    "tool_call_id": tool_call.id,
-                    "name": tool_name,
-                    "content": json.dumps(result, ensure_ascii=False)
-                })
-            
-            # 继续对话，允许 AI 再次调用工具（如 delete_event）
-            # 使用循环处理多轮工具调用，直到 AI 返回文字回复
-            max_iterations = 5
-            assistant_message = ""
-            for iteration in range(max_iterations):
-                final_response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    tools=self.tools,
-                    tool_choice="auto"
-                )
-                
-                final_message = final_response.choices[0].message
-                
-                # 如果 AI 不再调用工具，获取最终回复
-                if not final_message.tool_calls:
-                    assistant_message = final_message.content or ""
-                    break
-                
-                # AI 还想调用更多工具（如 delete_event），继续处理
-                messages.append({
-                    "role": "assistant",
-                    "content": final_message.content or "",
-                    "tool_calls": [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.function.name,
-                                "arguments": tc.function.arguments
-                            }
-                        }
-                        for tc in final_message.tool_calls
-                    ]
-                })
-                
-                # 执行新的工具调用
-                for tool_call in final_message.tool_calls:
-                    import json
-                    
-                    tool_name = tool_call.function.name
-                    tool_input = json.loads(tool_call.function.arguments)
-                    
-                    tool_calls.append({
-                        "name": tool_name,
-                        "input": tool_input
-                    })
-                    
-                    result = await self.mcp_server.execute_tool(tool_name, tool_input)
-                    
-                    if result.get("success") and "event" in result:
-                        events_modified.append(result["event"]["id"])
-                    
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "name": tool_name,
-                        "content": json.dumps(result, ensure_ascii=False)
-                    })
-            
-            if not assistant_message and iteration >= max_iterations - 1:
-                assistant_message = "处理超时，请重试"
+            await self._execute_tool_calls(
+                response_message.tool_calls, messages, tool_calls, events_modified, tool_cache
+            )
         else:
-            assistant_message = response_message.content or ""
+            assistant_message = "处理超时，请重试"
         
         # 确保 tool_calls 始终返回（即使是空列表），方便前端调试
         response_data = ChatResponse(
@@ -297,13 +254,78 @@ class ChatService:
             events_modified=events_modified if events_modified else None
         )
         
-        # 添加调试日志
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.info(f"Chat response: message={assistant_message[:50]}..., tool_calls_count={len(tool_calls)}, events_modified_count={len(events_modified)}")
+        # 添加调试日志（%s 延迟格式化，日志级别关闭时不构造字符串）
+        logger.info(
+            "Chat response: message=%s..., tool_calls_count=%d, events_modified_count=%d",
+            assistant_message[:50], len(tool_calls), len(events_modified)
+        )
         
         return response_data
     
+    async def _execute_tool_calls(
+        self,
+        response_tool_calls: List[Any],
+        messages: List[Dict[str, Any]],
+        tool_calls: List[Dict[str, Any]],
+        events_modified: List[str],
+        tool_cache: Dict[tuple, Dict[str, Any]]
+    ) -> None:
+        """
+        并发执行同一轮返回的所有工具调用，并按原始顺序记录结果
+        
+        Args:
+            response_tool_calls: 模型返回的工具调用列表
+            messages: 消息历史（追加工具结果）
+            tool_calls: 工具调用记录（追加调用信息）
+            events_modified: 修改的事件ID列表（追加事件ID）
+            tool_cache: 本次对话处理内的只读工具结果缓存
+        """
+        tool_inputs = [json.loads(tc.function.arguments) for tc in response_tool_calls]
+        cache_keys = [
+            (tc.function.name, json.dumps(tool_input, sort_keys=True))
+            for tc, tool_input in zip(response_tool_calls, tool_inputs)
+        ]
+        
+        async def execute(tool_name: str, tool_input: Dict[str, Any], cache_key: tuple) -> Dict[str, Any]:
+            if cache_key in tool_cache:
+                return tool_cache[cache_key]
+            return await self.mcp_server.execute_tool(tool_name, tool_input)
+        
+        # 同一轮的工具调用互不依赖，并发执行；execute_tool 内部已捕获异常
+        results = await asyncio.gather(*(
+            execute(tc.function.name, tool_input, cache_key)
+            for tc, tool_input, cache_key in zip(response_tool_calls, tool_inputs, cache_keys)
+        ))
+        
+        # 本轮有写操作时清空缓存，否则缓存成功的只读结果
+        if any(tool_name not in READ_ONLY_TOOLS for tool_name, _ in cache_keys):
+            tool_cache.clear()
+        else:
+            for cache_key, result in zip(cache_keys, results):
+                if result.get("success"):
+                    tool_cache[cache_key] = result
+        
+        for tool_call, tool_input, result in zip(response_tool_calls, tool_inputs, results):
+            tool_name = tool_call.function.name
+            
+            # 记录工具调用
+            tool_calls.append({
+                "name": tool_name,
+                "input": tool_input
+            })
+            
+            # 记录修改的事件
+            if result.get("success") and "event" in result:
+                events_modified.append(result["event"]["id"])
+            
+            # 添加工具结果
+            messages.append({
+                "role": "tool",
+                "tool_call_id": tool_call.id,
+                "name": tool_name,
+                "content": json.dumps(result, ensure_ascii=False)
+            })
+    
     def _build_messages(self, request: ChatRequest) -> List[Dict[str, Any]]:
         """
         构建消息列表
@@ -314,24 +336,14 @@ class ChatService:
         Returns:
             消息列表
         """
-        messages = []
-        
-        # 添加系统消息
-        messages.append({
-            "role": "system",
-            "content": self.system_prompt
-        })
-        
-        # 添加历史消息
-        for msg in request.conversation_history:
-            messages.append({
-                "role": msg.role,
-                "content": msg.content
-            })
+        # 系统消息在前，随后是历史消息，一次性构建列表
+        messages = [
+            {"role": "system", "content": self.system_prompt},
+            *({"role": msg.role, "content": msg.content} for msg in request.conversation_history)
+        ]
         
         # 添加当前消息（包含当前时间信息）
-        from datetime import datetime
-        current_time = datetime.now().isoformat()
+        current_time = datetime.now().isoformat(timespec="seconds")
         
         user_message = f"[当前时间: {current_time}]\n\n{request.message}"
         
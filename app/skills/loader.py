@@ -1,6 +1,6 @@
-import os
 from pathlib import Path
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 
 
 class SkillLoader:
@@ -13,15 +13,21 @@ class SkillLoader:
             skills_dir: Skills 目录路径
         """
         self.skills_dir = Path(skills_dir)
-        self.skills: Dict[str, str] = {}
-        self._load_all_skills()
+        # 启动加载完成后冻结为只读映射，避免运行期被意外修改
+        self.skills: Mapping[str, str] = MappingProxyType(self._load_all_skills())
     
     
-    def _load_all_skills(self):
-        """加载所有 SKILL.md文件"""
+    def _load_all_skills(self) -> Dict[str, str]:
+        """
+        加载所有 SKILL.md文件
+        
+        Returns:
+            Skill 名称到内容的字典
+        """
+        skills: Dict[str, str] = {}
         if not self.skills_dir.exists():
             print("Warning: Skills directory {self.skills_dir} does not exist.")
-            return 
+            return skills
         
         # 遍历所有子目录寻找SKILL.md 文件
         
@@ -30,8 +36,10 @@ class SkillLoader:
                 skill_file = skill_dir / "SKILL.md"
                 if skill_file.exists():
                     skill_name = skill_dir.name
-                    self.skills[skill_name] = self._load_skill_file(skill_file)
+                    skills[skill_name] = self._load_skill_file(skill_file)
                     print(f"Loaded skill: {skill_name}")
+        
+        return skills
     
     def _load_skill_file(self, file_path: Path) -> str:
         """
@@ -57,12 +65,12 @@ class SkillLoader:
         """
         return self.skills.get(skill_name)
 
-    def get_all_skills(self) -> Dict[str, str]:
+    def get_all_skills(self) -> Mapping[str, str]:
         """
         获取所有 Skills 的内容
         
         Returns:
-            包含所有 Skill 内容的字典，键为 Skill 名称，值为 Skill 内容
+            包含所有 Skill 内容的只读映射，键为 Skill 名称，值为 Skill 内容
         """
         return self.skills
     
@@ -77,12 +85,10 @@ class SkillLoader:
         Returns:
             组合后的 Skill文档
         """
-        combined = "# Available Skills\n\n"
-        for skill_name, skill_content in self.skills.items():
-            combined += f"## Skill: {skill_name}\n\n"
-            combined += skill_content
-            combined += "\n\n---\n\n"
-        return combined
+        return "# Available Skills\n\n" + "".join(
+            f"## Skill: {skill_name}\n\n{skill_content}\n\n---\n\n"
+            for skill_name, skill_content in self.skills.items()
+        )
     
 
 # 全局Skills 加载器实例
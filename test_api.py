@@ -3,6 +3,8 @@
 测试脚本 - 测试 Calendar MCP Backend 的各个功能
 """
 
+import os
+import sys
 import requests
 import json
 from datetime import datetime, timedelta
@@ -10,8 +12,8 @@ from datetime import datetime, timedelta
 # API 基础 URL
 BASE_URL = "https://api.moonshot.cn/v1"
 
-# 你的 Anthropic API Key（测试用）
-API_KEY = "sk-kimi-bGmbnpqS9eMZIQLTbP1YSEYREoXcbNCXMm8XZfHR022UKXK8eIWtC2mmlhFm3MA8"  # 替换为你的 API Key
+# API Key 从环境变量读取（与 .env 中的 API_KEY 一致）
+API_KEY = os.environ.get("API_KEY")
 
 # 请求头
 HEADERS = {
@@ -19,6 +21,10 @@ HEADERS = {
     "X-API-Key": API_KEY  # 添加 API Key 到请求头
 }
 
+# 共享会话，复用底层连接
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+
 
 def print_response(title, response):
     """打印响应"""
@@ -27,7 +33,8 @@ def print_response(title, response):
     print(f"{'='*60}")
     print(f"Status: {response.status_code}")
     print(f"Response:")
-    print(json.dumps(response.json(), indent=2, ensure_ascii=False))
+    json.dump(response.json(), sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
 
 
 def test_chat_create_event():
@@ -39,7 +46,7 @@ def test_chat_create_event():
         "conversation_history": []
     }
     
-    response = requests.post(url, json=data, headers=HEADERS)
+    response = SESSION.post(url, json=data)
     print_response("测试 1: 通过对话创建事件", response)
     return response
 
@@ -53,7 +60,7 @@ def test_chat_list_events():
         "conversation_history": []
     }
     
-    response = requests.post(url, json=data, headers=HEADERS)
+    response = SESSION.post(url, json=data)
     print_response("测试 2: 通过对话查询事件", response)
     return response
 
@@ -67,8 +74,8 @@ def test_without_api_key():
         "conversation_history": []
     }
     
-    # 不传 API Key
-    response = requests.post(url, json=data, headers={"Content-Type": "application/json"})
+    # 不传 API Key（值为 None 的请求头会覆盖并移除会话中的同名头）
+    response = SESSION.post(url, json=data, headers={"X-API-Key": None})
     print_response("测试: 不传 API Key（应该返回 401）", response)
     return response
 
@@ -79,14 +86,14 @@ def main():
     print("Calendar MCP Backend 测试")
     print("="*60)
     
-    if API_KEY == "sk-ant-xxxxx":
-        print("\n⚠️  警告: 请先在脚本中设置你的 API_KEY")
-        print("修改 test_api.py 中的 API_KEY 变量\n")
-        return
+    if not API_KEY:
+        print("\n⚠️  警告: 请先设置环境变量 API_KEY")
+        print("例如: API_KEY=your_api_key python test_api.py\n")
+        sys.exit(1)
     
     try:
         # 检查服务是否运行
-        response = requests.get("http://localhost:8000/health")
+        response = SESSION.get("http://localhost:8000/health")
         if response.status_code != 200:
             print("错误: 服务未运行，请先启动服务")
             return